@@ -4,111 +4,55 @@ Docker Escape Detection Lab - Python Deployment Automation
 Provides cross-platform deployment automation with comprehensive error handling
 """
 
+import atexit
 import os
 import sys
 import subprocess
 import json
+import re
 import time
-import requests
-import platform
 import shutil
 import logging
-from pathlib import Path
+import logging.handlers
+from pathlib import Path, PurePosixPath
 from typing import Dict, List, Optional, Tuple
 import argparse
+import functools
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Buffer log file writes, flushing every 64 records, on errors, and at exit
+_log_file_handler = logging.FileHandler('lab-deployment.log')
+_log_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+_log_buffer_handler = logging.handlers.MemoryHandler(
+    64, flushLevel=logging.ERROR, target=_log_file_handler
+)
+atexit.register(_log_buffer_handler.flush)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler('lab-deployment.log'),
+        _log_buffer_handler,
         logging.StreamHandler(sys.stdout)
     ]
 )
 logger = logging.getLogger(__name__)
 
-class LabDeployment:
-    """Main deployment orchestrator for Docker Escape Detection Lab"""
-    
-    def __init__(self, config: Dict):
-        self.config = config
-        self.lab_dir = Path(config.get('lab_directory', 'docker-escape-lab'))
-        self.platform = platform.system().lower()
-        self.deployment_steps = []
-        
-    def check_prerequisites(self) -> bool:
-        """Check system prerequisites"""
-        logger.info("🔍 Checking system prerequisites...")
-        
-        # Check Docker
-        if not self._command_exists('docker'):
-            logger.error("❌ Docker not found. Please install Docker Desktop")
-            return False
-        logger.info("✅ Docker is installed")
-        
-        # Check Docker Compose
-        if not self._command_exists('docker-compose') and not self._command_exists('docker compose'):
-            logger.error("❌ Docker Compose not found")
-            return False
-        logger.info("✅ Docker Compose is available")
-        
-        # Check Docker daemon
-        try:
-            subprocess.run(['docker', 'info'], capture_output=True, check=True)
-            logger.info("✅ Docker daemon is running")
-        except subprocess.CalledProcessError:
-            logger.error("❌ Docker daemon is not running. Please start Docker")
-            return False
-            
-        # Check disk space (10GB minimum)
-        free_space = shutil.disk_usage('.').free / (1024**3)  # GB
-        if free_space < 10:
-            logger.warning(f"⚠️  Low disk space: {free_space:.1f}GB available")
-        else:
-            logger.info(f"✅ Sufficient disk space: {free_space:.1f}GB available")
-            
-        return True
-    
-    def create_project_structure(self) -> bool:
-        """Create lab directory structure"""
-        logger.info("📁 Creating project structure...")
-        
-        try:
-            # Backup existing directory if it exists
-            if self.lab_dir.exists():
-                backup_name = f"{self.lab_dir}.backup.{int(time.time())}"
-                self.lab_dir.rename(backup_name)
-                logger.info(f"📦 Backed up existing directory to {backup_name}")
-            
-            # Create directory structure
-            directories = [
-                'configs/falco',
-                'configs/filebeat', 
-                'configs/xsiam',
-                'logs/falco',
-                'logs/filebeat',
-                'logs/response',
-                'scripts/response',
-                'scripts/automation',
-                'data'
-            ]
-            
-            for dir_path in directories:
-                (self.lab_dir / dir_path).mkdir(parents=True, exist_ok=True)
-                
-            logger.info("✅ Project structure created")
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to create project structure: {e}")
-            return False
-    
-    def generate_docker_compose(self) -> bool:
-        """Generate Docker Compose configuration"""
-        logger.info("🐳 Creating Docker Compose configuration...")
-        
-        compose_content = """version: '3.8'
+SERVICE_READY_TIMEOUT = 300  # seconds
+
+# Priority field of Falco's plain-text alert output: "<time>: <Priority> <message>"
+FALCO_PRIORITY_PATTERN = re.compile(r'^\S+: ([A-Za-z]+) ')
+
+# Compose error and container status lines that mean the deployment cannot succeed.
+# Anchored so warnings or paths that merely contain "error"/"failed" don't match.
+COMPOSE_FAILURE_PATTERN = re.compile(r'^\s*(?:Error\b|Container \S+\s+(?:Error|[Uu]nhealthy)\b)')
+
+# Docker Compose configuration
+_COMPOSE_YML: bytes = b"""version: '3.8'
 
 services:
   # Falco - Runtime Security Monitoring
@@ -170,6 +114,12 @@ services:
     networks:
       - monitoring
     restart: unless-stopped
+    healthcheck:
+      test: ["CMD-SHELL", "curl -f http://localhost:5601/api/status || exit 1"]
+      interval: 30s
+      timeout: 10s
+      retries: 5
+      start_period: 120s
 
   # Filebeat for log forwarding
   filebeat:
@@ -217,22 +167,14 @@ networks:
   monitoring:
     driver: bridge
 """
-        
-        try:
-            with open(self.lab_dir / 'docker-compose.yml', 'w') as f:
-                f.write(compose_content)
-            logger.info("✅ Docker Compose configuration created")
-            return True
-        except Exception as e:
-            logger.error(f"❌ Failed to create Docker Compose file: {e}")
-            return False
-    
-    def generate_configurations(self) -> bool:
-        """Generate Falco and Filebeat configurations"""
-        logger.info("⚙️  Creating security configurations...")
-        
-        # Falco rules
-        falco_rules = """# Container Escape Detection Rules
+
+# Images referenced by the compose file, in declaration order
+_COMPOSE_IMAGES: Tuple[str, ...] = tuple(dict.fromkeys(
+    image.decode() for image in re.findall(rb'^\s*image:\s*(\S+)', _COMPOSE_YML, re.MULTILINE)
+))
+
+# Falco rules
+_FALCO_RULES_YAML: bytes = b"""# Container Escape Detection Rules
 
 - rule: Container Escape via Privileged Mount
   desc: Detect container attempting to access host filesystem
@@ -284,9 +226,9 @@ networks:
   priority: HIGH
   tags: [container, privilege_escalation, T1548]
 """
-        
-        # Filebeat configuration
-        filebeat_config = """filebeat.inputs:
+
+# Filebeat configuration
+_FILEBEAT_YML: bytes = b"""filebeat.inputs:
 - type: log
   enabled: true
   paths:
@@ -326,29 +268,9 @@ setup.kibana:
 
 logging.level: info
 """
-        
-        try:
-            # Write Falco rules
-            with open(self.lab_dir / 'configs/falco/falco_rules.yaml', 'w') as f:
-                f.write(falco_rules)
-                
-            # Write Filebeat config
-            with open(self.lab_dir / 'configs/filebeat/filebeat.yml', 'w') as f:
-                f.write(filebeat_config)
-                
-            logger.info("✅ Security configurations created")
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to create configurations: {e}")
-            return False
-    
-    def create_automation_scripts(self) -> bool:
-        """Create automation and response scripts"""
-        logger.info("🤖 Creating automation scripts...")
-        
-        # Attack simulation script
-        attack_script = """#!/bin/bash
+
+# Attack simulation script
+_SIMULATE_ATTACKS_SH: bytes = b"""#!/bin/bash
 # Simulate various container escape attacks for testing
 
 echo "Starting attack simulation suite..."
@@ -370,9 +292,9 @@ sleep 2
 
 echo "Attack simulation completed. Check Falco logs for detection results."
 """
-        
-        # Health check script
-        health_script = """#!/bin/bash
+
+# Health check script
+_HEALTH_CHECK_SH: bytes = b"""#!/bin/bash
 # Check health of all lab components
 
 echo "=== Docker Escape Detection Lab Health Check ==="
@@ -396,19 +318,231 @@ echo
 
 echo "Health check completed."
 """
+
+
+@functools.lru_cache(maxsize=None)
+def _which(command: str) -> Optional[str]:
+    """Locate a command on PATH, caching the result for the process lifetime"""
+    return shutil.which(command)
+
+@functools.lru_cache(maxsize=None)
+def _platform() -> str:
+    """Return the operating system name, cached for the process lifetime"""
+    import platform
+    return platform.system()
+
+def _image_repository(image: str) -> str:
+    """Strip the tag or digest from an image reference, leaving its repository"""
+    repository = image.split('@', 1)[0]
+    name_start = repository.rfind('/') + 1
+    tag_sep = repository.rfind(':')
+    return repository[:tag_sep] if tag_sep >= name_start else repository
+
+def _write_if_changed(path: Path, data: bytes) -> bool:
+    """Write data to path unless the file already holds identical content"""
+    digest = hashlib.sha256(data).digest()
+    if path.exists() and hashlib.sha256(path.read_bytes()).digest() == digest:
+        return False
+    path.write_bytes(data)
+    return True
+
+def _write_script(path: Path, data: bytes) -> None:
+    """Write an executable script with mode 0755"""
+    # O_BINARY keeps Windows from translating the scripts' LF line endings
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(path, flags, 0o755)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    # The open mode only applies on creation and is masked by umask, so set it explicitly;
+    # os.fchmod would avoid the path lookup but is unavailable on Windows before 3.13
+    os.chmod(path, 0o755)
+
+class LabDeployment:
+    """Main deployment orchestrator for Docker Escape Detection Lab"""
+    
+    def __init__(self, config: Dict):
+        self.config = config
+        self.lab_dir = Path(config.get('lab_directory', 'docker-escape-lab'))
+        self.deployment_steps = []
+        self._pull_process: Optional[subprocess.Popen] = None
+        self._pull_skipped = False
+        self._free_gb: Optional[float] = None
+        self._image_digests: Dict[str, str] = {}
+        
+    @property
+    def platform(self) -> str:
+        """Lower-cased operating system name"""
+        return _platform().lower()
+    
+    def check_prerequisites(self) -> bool:
+        """Check system prerequisites"""
+        logger.info("🔍 Checking system prerequisites...")
+        
+        # Probes are I/O bound and independent, so run them concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            docker_future = executor.submit(_which, 'docker')
+            compose_future = executor.submit(_which, 'docker-compose')
+            daemon_future = executor.submit(self._docker_daemon_running)
+            disk_future = executor.submit(shutil.disk_usage, '.')
+        
+        # Check Docker
+        if docker_future.result() is None:
+            logger.error("❌ Docker not found. Please install Docker Desktop")
+            return False
+        logger.info("✅ Docker is installed")
+        
+        # Check Docker Compose
+        if compose_future.result() is None and _which('docker compose') is None:
+            logger.error("❌ Docker Compose not found")
+            return False
+        logger.info("✅ Docker Compose is available")
+        
+        # Check Docker daemon
+        if not daemon_future.result():
+            logger.error("❌ Docker daemon is not running. Please start Docker")
+            return False
+        logger.info("✅ Docker daemon is running")
+            
+        # Check disk space (10GB minimum)
+        self._free_gb = disk_future.result().free / (1024**3)  # GB
+        if self._free_gb < 10:
+            logger.warning(f"⚠️  Low disk space: {self._free_gb:.1f}GB available")
+        else:
+            logger.info(f"✅ Sufficient disk space: {self._free_gb:.1f}GB available")
+            
+        return True
+    
+    def create_project_structure(self) -> bool:
+        """Create lab directory structure"""
+        logger.info("📁 Creating project structure...")
+        
+        try:
+            # Backup existing directory if it exists, unless redeploying in place
+            if self.lab_dir.exists() and not self.config.get('redeploy'):
+                backup_name = f"{self.lab_dir}.backup.{time.time_ns()}"
+                os.rename(self.lab_dir, backup_name)
+                logger.info(f"📦 Backed up existing directory to {backup_name}")
+            
+            # Create directory structure
+            directories = [
+                'configs/falco',
+                'configs/filebeat', 
+                'configs/xsiam',
+                'logs/falco',
+                'logs/filebeat',
+                'logs/response',
+                'scripts/response',
+                'scripts/automation',
+                'data'
+            ]
+            
+            # Create each top-level directory once so leaves don't re-walk their parents
+            roots = dict.fromkeys(PurePosixPath(dir_path).parts[0] for dir_path in directories)
+            for root in roots:
+                (self.lab_dir / root).mkdir(parents=True, exist_ok=True)
+            for dir_path in directories:
+                if dir_path not in roots:
+                    (self.lab_dir / dir_path).mkdir(exist_ok=True)
+                
+            logger.info("✅ Project structure created")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to create project structure: {e}")
+            return False
+    
+    def generate_lab_files(self) -> bool:
+        """Generate lab files, overlapping the image pull with config and script writes"""
+        # The pull needs the compose file, so write it first
+        if not self.generate_docker_compose():
+            return False
+        
+        # The image check and pull start run alongside the disjoint config and script writes
+        generators = [
+            self.start_image_pull,
+            self.generate_configurations,
+            self.create_automation_scripts,
+        ]
+        
+        with ThreadPoolExecutor(max_workers=len(generators)) as executor:
+            results = list(executor.map(lambda generator: generator(), generators))
+        
+        return all(results)
+    
+    def generate_docker_compose(self) -> bool:
+        """Generate Docker Compose configuration"""
+        logger.info("🐳 Creating Docker Compose configuration...")
+        
+        try:
+            (self.lab_dir / 'docker-compose.yml').write_bytes(_COMPOSE_YML)
+            logger.info("✅ Docker Compose configuration created")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to create Docker Compose file: {e}")
+            return False
+    
+    def start_image_pull(self) -> bool:
+        """Start pulling Docker images in the background"""
+        if not self.config.get('force_pull') and self._images_present():
+            logger.info("✅ All Docker images present locally, skipping pull")
+            self._pull_skipped = True
+            return True
+        
+        logger.info("📥 Pulling Docker images in the background...")
+        
+        try:
+            # Overlap the network-bound pull with the remaining local file generation
+            self._pull_process = subprocess.Popen(
+                ['docker', 'compose', 'pull'], cwd=self.lab_dir
+            )
+            return True
+        except OSError as e:
+            logger.error(f"❌ Failed to start image pull: {e}")
+            return False
+    
+    def _stop_image_pull(self) -> None:
+        """Terminate and reap a background image pull that is still pending"""
+        pull_process, self._pull_process = self._pull_process, None
+        if pull_process is None:
+            return
+        if pull_process.poll() is None:
+            logger.info("🛑 Stopping background Docker image pull...")
+            pull_process.terminate()
+        pull_process.wait()
+    
+    def generate_configurations(self) -> bool:
+        """Generate Falco and Filebeat configurations"""
+        logger.info("⚙️  Creating security configurations...")
+        
+        # Unchanged files are left alone so Falco and Filebeat don't reload them
+        try:
+            # Write Falco rules
+            _write_if_changed(self.lab_dir / 'configs/falco/falco_rules.yaml', _FALCO_RULES_YAML)
+            
+            # Write Filebeat config
+            _write_if_changed(self.lab_dir / 'configs/filebeat/filebeat.yml', _FILEBEAT_YML)
+            
+            logger.info("✅ Security configurations created")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to create configurations: {e}")
+            return False
+    
+    def create_automation_scripts(self) -> bool:
+        """Create automation and response scripts"""
+        logger.info("🤖 Creating automation scripts...")
         
         try:
             # Write attack simulation script
-            script_path = self.lab_dir / 'scripts/automation/simulate_attacks.sh'
-            with open(script_path, 'w') as f:
-                f.write(attack_script)
-            script_path.chmod(0o755)
+            _write_script(self.lab_dir / 'scripts/automation/simulate_attacks.sh', _SIMULATE_ATTACKS_SH)
             
             # Write health check script
-            health_path = self.lab_dir / 'scripts/automation/health_check.sh'
-            with open(health_path, 'w') as f:
-                f.write(health_script)
-            health_path.chmod(0o755)
+            _write_script(self.lab_dir / 'scripts/automation/health_check.sh', _HEALTH_CHECK_SH)
             
             logger.info("✅ Automation scripts created")
             return True
@@ -422,51 +556,33 @@ echo "Health check completed."
         logger.info("🚀 Deploying lab services...")
         
         try:
-            # Change to lab directory
-            os.chdir(self.lab_dir)
+            # Pull images first, or wait for the background pull to finish
+            if self._pull_skipped:
+                logger.info("📦 Using local Docker images")
+            elif self._pull_process is None:
+                logger.info("📥 Pulling Docker images...")
+                subprocess.run(['docker', 'compose', 'pull'], check=True, cwd=self.lab_dir)
+            else:
+                logger.info("📥 Waiting for Docker image pull to finish...")
+                pull_process, self._pull_process = self._pull_process, None
+                if pull_process.wait() != 0:
+                    raise subprocess.CalledProcessError(pull_process.returncode, pull_process.args)
             
-            # Pull images first
-            logger.info("📥 Pulling Docker images...")
-            subprocess.run(['docker', 'compose', 'pull'], check=True)
+            # Pin images to the digests just pulled so redeploys reuse identical layers
+            self._pin_image_digests()
             
             # Start services
-            logger.info("🔄 Starting services...")
-            subprocess.run(['docker', 'compose', 'up', '-d'], check=True)
+            logger.info("🔄 Starting services and waiting for them to become healthy...")
+            env = dict(os.environ, DOCKER_BUILDKIT='1', COMPOSE_DOCKER_CLI_BUILD='1')
+            self._compose_up(env)
             
             logger.info("✅ Services deployed successfully")
             return True
             
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, OSError) as e:
             logger.error(f"❌ Failed to deploy services: {e}")
             return False
     
-    def wait_for_services(self) -> bool:
-        """Wait for services to be ready"""
-        logger.info("⏳ Waiting for services to initialize...")
-        
-        services = {
-            'Elasticsearch': 'http://localhost:9200/_cluster/health',
-            'Kibana': 'http://localhost:5601',
-        }
-        
-        for service_name, url in services.items():
-            logger.info(f"🔍 Checking {service_name}...")
-            for attempt in range(30):  # 5 minutes total
-                try:
-                    response = requests.get(url, timeout=5)
-                    if response.status_code == 200:
-                        logger.info(f"✅ {service_name} is ready")
-                        break
-                except requests.exceptions.RequestException:
-                    pass
-                
-                if attempt < 29:  # Don't sleep on last attempt
-                    time.sleep(10)
-            else:
-                logger.warning(f"⚠️  {service_name} may still be initializing")
-        
-        return True
-    
     def run_tests(self) -> bool:
         """Run initial tests"""
         logger.info("🧪 Running initial tests...")
@@ -476,6 +592,7 @@ echo "Health check completed."
             time.sleep(10)
             
             # Run attack simulation
+            simulation_start = int(time.time())
             result = subprocess.run([
                 str(self.lab_dir / 'scripts/automation/simulate_attacks.sh')
             ], capture_output=True, text=True)
@@ -485,12 +602,17 @@ echo "Health check completed."
             
             # Check for generated alerts
             time.sleep(5)
-            alert_result = subprocess.run([
-                'docker', 'logs', 'docker-escape-falco'
-            ], capture_output=True, text=True)
-            
-            critical_alerts = alert_result.stdout.count('CRITICAL')
-            high_alerts = alert_result.stdout.count('HIGH')
+            critical_alerts = high_alerts = 0
+            with subprocess.Popen([
+                'docker', 'logs', '--since', str(simulation_start), 'docker-escape-falco'
+            ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True) as alert_proc:
+                # Only alerts raised since the simulation started, counted in one pass
+                for line in alert_proc.stdout:
+                    priority = self._alert_priority(line)
+                    if priority == 'CRITICAL':
+                        critical_alerts += 1
+                    elif priority == 'HIGH':
+                        high_alerts += 1
             
             if critical_alerts > 0 or high_alerts > 0:
                 logger.info(f"✅ Generated {critical_alerts} CRITICAL and {high_alerts} HIGH alerts")
@@ -503,15 +625,39 @@ echo "Health check completed."
             logger.error(f"❌ Failed to run tests: {e}")
             return False
     
+    def _alert_priority(self, line: str) -> Optional[str]:
+        """Extract the priority of a Falco alert line, if it is one"""
+        if line.startswith('{'):
+            # JSON output carries the priority as a structured field
+            try:
+                return str(json.loads(line).get('priority', '')).upper() or None
+            except (ValueError, AttributeError):
+                return None
+        match = FALCO_PRIORITY_PATTERN.match(line)
+        return match.group(1).upper() if match else None
+    
     def generate_summary(self) -> bool:
         """Generate deployment summary"""
+        import platform
+        
         logger.info("📋 Generating deployment summary...")
         
+        # Reuse the measurement from the prerequisites check
+        free_space = f"{self._free_gb:.1f}GB" if self._free_gb is not None else "unknown"
+        image_digests = "\n".join(
+            f"- `{image}` -> `{digest}`" for image, digest in self._image_digests.items()
+        ) or "- No images pinned (tags used as declared)"
+        digest_source = (
+            "resolved from images already present locally" if self._pull_skipped
+            else "pulled during this deployment"
+        )
+        
         summary = f"""# Docker Escape Detection Lab - Deployment Summary
 
 **Deployment Date:** {time.strftime('%Y-%m-%d %H:%M:%S')}
 **Lab Directory:** {self.lab_dir.resolve()}
-**Platform:** {platform.system()} {platform.release()}
+**Platform:** {_platform()} {platform.release()}
+**Free Disk Space:** {free_space}
 **Deployed by:** Python Automation Script
 
 ## Services Deployed
@@ -522,6 +668,12 @@ echo "Health check completed."
 - **Filebeat**: Log forwarding agent
 - **Test Containers**: Vulnerable targets for testing
 
+## Image Digests
+
+Images in `docker-compose.yml` are pinned to the digests {digest_source}:
+
+{image_digests}
+
 ## Access URLs
 
 - **Kibana Dashboard**: http://localhost:5601
@@ -568,8 +720,7 @@ python3 {Path(__file__).name} --run-tests
 """
         
         try:
-            with open(self.lab_dir / 'python-deployment-summary.md', 'w') as f:
-                f.write(summary)
+            (self.lab_dir / 'python-deployment-summary.md').write_text(summary, encoding='utf-8')
             logger.info("✅ Deployment summary saved")
             return True
         except Exception as e:
@@ -583,21 +734,22 @@ python3 {Path(__file__).name} --run-tests
         steps = [
             ("Prerequisites Check", self.check_prerequisites),
             ("Project Structure", self.create_project_structure),
-            ("Docker Compose", self.generate_docker_compose),
-            ("Configurations", self.generate_configurations),
-            ("Automation Scripts", self.create_automation_scripts),
+            ("Lab Files", self.generate_lab_files),
             ("Service Deployment", self.deploy_services),
-            ("Service Readiness", self.wait_for_services),
             ("Initial Tests", self.run_tests),
             ("Summary Generation", self.generate_summary),
         ]
         
-        for step_name, step_func in steps:
-            logger.info(f"🔄 Executing: {step_name}")
-            if not step_func():
-                logger.error(f"❌ Failed at step: {step_name}")
-                return False
-            self.deployment_steps.append(step_name)
+        try:
+            for step_name, step_func in steps:
+                logger.info(f"🔄 Executing: {step_name}")
+                if not step_func():
+                    logger.error(f"❌ Failed at step: {step_name}")
+                    return False
+                self.deployment_steps.append(step_name)
+        finally:
+            # Don't leave a background pull running after a failed step
+            self._stop_image_pull()
         
         logger.info("🎉 Lab deployment completed successfully!")
         logger.info("🔗 Kibana Dashboard: http://localhost:5601")
@@ -609,19 +761,102 @@ python3 {Path(__file__).name} --run-tests
     def health_check(self) -> bool:
         """Perform health check"""
         try:
-            os.chdir(self.lab_dir)
+            # Absolute path, since a relative executable is resolved against cwd
             result = subprocess.run([
-                str(self.lab_dir / 'scripts/automation/health_check.sh')
-            ], capture_output=True, text=True)
+                str((self.lab_dir / 'scripts/automation/health_check.sh').resolve())
+            ], capture_output=True, text=True, cwd=self.lab_dir)
             print(result.stdout)
             return result.returncode == 0
         except Exception as e:
             logger.error(f"Health check failed: {e}")
             return False
     
-    def _command_exists(self, command: str) -> bool:
-        """Check if command exists"""
-        return shutil.which(command) is not None
+    def _compose_up(self, env: Dict[str, str]) -> None:
+        """Start services, streaming output and aborting on the first failure"""
+        # --wait blocks until services are running and healthchecks report healthy
+        command = [
+            'docker', 'compose', 'up', '-d',
+            '--wait', '--wait-timeout', str(SERVICE_READY_TIMEOUT)
+        ]
+        with subprocess.Popen(
+            command, cwd=self.lab_dir, env=env,
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1, text=True
+        ) as proc:
+            failure = None
+            for line in proc.stdout:
+                line = line.rstrip()
+                logger.info(line)
+                if line.lstrip().startswith('WARN'):
+                    continue
+                if COMPOSE_FAILURE_PATTERN.match(line):
+                    failure = line
+                    proc.terminate()
+                    break
+            returncode = proc.wait()
+        
+        if failure is not None or returncode != 0:
+            logger.error("↩️  Rolling back partially started services...")
+            subprocess.run(['docker', 'compose', 'down'], capture_output=True, cwd=self.lab_dir)
+            raise subprocess.CalledProcessError(returncode or 1, command, output=failure)
+    
+    def _pin_image_digests(self) -> None:
+        """Rewrite the compose file to reference images by digest"""
+        self._image_digests = self._resolve_digests()
+        compose_content = _COMPOSE_YML
+        for image, digest in self._image_digests.items():
+            compose_content = compose_content.replace(
+                b'image: ' + image.encode() + b'\n', b'image: ' + digest.encode() + b'\n'
+            )
+        (self.lab_dir / 'docker-compose.yml').write_bytes(compose_content)
+        logger.info(f"📌 Pinned {len(self._image_digests)}/{len(_COMPOSE_IMAGES)} images by digest")
+    
+    def _resolve_digests(self) -> Dict[str, str]:
+        """Map each compose image to its local repository digest, where known"""
+        with ThreadPoolExecutor(max_workers=len(_COMPOSE_IMAGES)) as executor:
+            digests = executor.map(self._resolve_digest, _COMPOSE_IMAGES)
+            return {
+                image: digest
+                for image, digest in zip(_COMPOSE_IMAGES, digests)
+                if digest
+            }
+    
+    def _resolve_digest(self, image: str) -> Optional[str]:
+        """Return the repository digest reference (repo@sha256:...) of a local image"""
+        try:
+            result = subprocess.run([
+                'docker', 'image', 'inspect', '--format', '{{json .RepoDigests}}', image
+            ], capture_output=True, text=True)
+            repo_digests = json.loads(result.stdout) if result.returncode == 0 else None
+        except (OSError, ValueError):
+            return None
+        
+        # Only pin to a digest from the declared repository, never a mirror or re-tag
+        repository = _image_repository(image)
+        for repo_digest in repo_digests or []:
+            if _image_repository(repo_digest) == repository:
+                return repo_digest
+        return None
+    
+    def _images_present(self) -> bool:
+        """Check if every image in the compose file is available locally"""
+        with ThreadPoolExecutor(max_workers=len(_COMPOSE_IMAGES)) as executor:
+            return all(executor.map(self._image_present, _COMPOSE_IMAGES))
+    
+    def _image_present(self, image: str) -> bool:
+        """Check if an image is available locally"""
+        try:
+            result = subprocess.run(['docker', 'image', 'inspect', image], capture_output=True)
+        except OSError:
+            return False
+        return result.returncode == 0
+    
+    def _docker_daemon_running(self) -> bool:
+        """Check if the Docker daemon responds"""
+        try:
+            result = subprocess.run(['docker', 'info'], capture_output=True)
+        except OSError:
+            return False
+        return result.returncode == 0
 
 def main():
     parser = argparse.ArgumentParser(description='Docker Escape Detection Lab - Python Deployment')
@@ -632,6 +867,7 @@ def main():
     parser.add_argument('--health-check', action='store_true', help='Run health check only')
     parser.add_argument('--run-tests', action='store_true', help='Run tests only')
     parser.add_argument('--redeploy', action='store_true', help='Redeploy lab')
+    parser.add_argument('--force-pull', action='store_true', help='Pull images even if present locally')
     
     args = parser.parse_args()
     
@@ -640,6 +876,8 @@ def main():
         'lab_directory': args.lab_dir,
         'xsiam_url': args.xsiam_url or os.getenv('XSIAM_URL', ''),
         'xsiam_api_key': args.xsiam_key or os.getenv('YOUR_XSIAM_API_KEY', ''),
+        'force_pull': args.force_pull,
+        'redeploy': args.redeploy,
     }
     
     # Load config file if exists